@@ -1,31 +1,35 @@
 # app/routers/dashboard.py
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
+from functools import lru_cache
+import asyncio
+import time
 import plotly.graph_objects as go
-import plotly.utils
-from datetime import datetime, timedelta
-from httpx import AsyncClient
- # import the FastAPI app for in-process calls
+import plotly.io as pio
+from datetime import datetime, timedelta, timezone
+
+from app.services.hash_service import hash_service
+from app.api.v1.endpoints.health import collect_health_status
 
 router = APIRouter(tags=["dashboard"])
 
+def _encode_chart(fig: go.Figure) -> bytes:
+    """Embed the figure JSON as an object so clients parse a single document"""
+    return b'{"chart_data":' + pio.to_json(fig).encode() + b'}'
+
 # ---------- Overview ----------
 @router.get("/overview")
 async def get_dashboard_overview():
-    from app.main import app 
-    async with AsyncClient(app=app, base_url="https://hack-kp-grapnel-backend.onrender.com") as client:
-        # Hash stats
-        
-        stats_resp = await client.get("/api/v1/hashes/stats")
-        if stats_resp.status_code != 200:
-            raise HTTPException(500, "Failed to fetch hash stats")
-        stats = stats_resp.json()
-
-        # Health
-        health_resp = await client.get("/api/v1/health")
-        health = health_resp.json() if health_resp.status_code == 200 else {}
+    # Hash stats and health are independent, gather them concurrently
+    try:
+        stats, health = await asyncio.gather(
+            hash_service.compute_hash_stats(),
+            collect_health_status()
+        )
+    except Exception:
+        raise HTTPException(500, "Failed to fetch hash stats")
 
     return {
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
         "stats": stats,
         "alerts": [],  # will fill later
         "system_status": health,
@@ -34,13 +38,14 @@ async def get_dashboard_overview():
 # ---------- Hash Activity ----------
 @router.get("/hash-activity")
 async def get_hash_activity_chart():
-    from app.main import app 
-    end_time = datetime.utcnow()
+    end_time = datetime.now(timezone.utc)
     hours = [end_time - timedelta(hours=i) for i in range(24)][::-1]
 
-    async with AsyncClient(app=app, base_url="http://test") as client:
-        stats_resp = await client.get("/api/v1/hashes/stats")
-        total_hashes = stats_resp.json().get("total_hashes", 0) if stats_resp.status_code == 200 else 0
+    try:
+        stats = await hash_service.compute_hash_stats()
+        total_hashes = stats.get("total_hashes", 0)
+    except Exception:
+        total_hashes = 0
 
     values = [max(0, total_hashes // 24) for _ in hours]
 
@@ -61,11 +66,10 @@ async def get_hash_activity_chart():
         hovermode="x unified",
     )
 
-    return {"chart_data": plotly.utils.PlotlyJSONEncoder().encode(fig)}
+    return Response(content=_encode_chart(fig), media_type="application/json")
 
 # ---------- Match Heatmap ----------
-@router.get("/match-heatmap")
-async def get_match_heatmap():
+def _build_match_heatmap() -> bytes:
     systems = ["trace", "grapnel", "takedown"]
 
     values = [[0 if i == j else (i + j) * 5 for j in range(len(systems))] for i in range(len(systems))]
@@ -83,15 +87,23 @@ async def get_match_heatmap():
 
     fig.update_layout(title="🔥 Cross-System Hash Match Heatmap", template="plotly_dark")
 
-    return {"chart_data": plotly.utils.PlotlyJSONEncoder().encode(fig)}
+    return _encode_chart(fig)
+
+# Built from constants only, so encode it once at import
+_MATCH_HEATMAP_JSON = _build_match_heatmap()
+
+@router.get("/match-heatmap")
+async def get_match_heatmap():
+    return Response(content=_MATCH_HEATMAP_JSON, media_type="application/json")
 
 # ---------- Alerts Timeline ----------
-@router.get("/alerts-timeline")
-async def get_alerts_timeline():
+@lru_cache(maxsize=1)
+def _build_alerts_timeline(minute: int) -> bytes:
+    now = datetime.fromtimestamp(minute * 60, timezone.utc)
     alerts = [
-        {"timestamp": datetime.utcnow().isoformat(), "severity": "critical"},
-        {"timestamp": (datetime.utcnow() - timedelta(hours=2)).isoformat(), "severity": "high"},
-        {"timestamp": (datetime.utcnow() - timedelta(hours=5)).isoformat(), "severity": "medium"},
+        {"timestamp": now.isoformat(), "severity": "critical"},
+        {"timestamp": (now - timedelta(hours=2)).isoformat(), "severity": "high"},
+        {"timestamp": (now - timedelta(hours=5)).isoformat(), "severity": "medium"},
     ]
 
     fig = go.Figure()
@@ -122,4 +134,12 @@ async def get_alerts_timeline():
         template="plotly_dark",
     )
 
-    return {"chart_data": plotly.utils.PlotlyJSONEncoder().encode(fig)}
+    return _encode_chart(fig)
+
+@router.get("/alerts-timeline")
+async def get_alerts_timeline():
+    # Only the timestamps change, so rebuild the chart at most once a minute
+    return Response(
+        content=_build_alerts_timeline(int(time.time() // 60)),
+        media_type="application/json"
+    )
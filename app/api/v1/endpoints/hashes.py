@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Response
 from typing import List
 import time
 
@@ -24,8 +24,7 @@ async def lookup_hashes(
     """
     
     # Rate limiting check
-    rate_limit_key = f"rate_limit:{request.source_system.value}"
-    current_requests = await redis_manager.increment_rate_limit(rate_limit_key)
+    current_requests = await redis_manager.sliding_window_check(request.source_system.value, 100)
     
     if current_requests > 100:  # 100 requests per minute per system
         raise HTTPException(
@@ -63,8 +62,7 @@ async def register_hashes(
         )
     
     # Rate limiting check
-    rate_limit_key = f"rate_limit:{source_system.value}"
-    current_requests = await redis_manager.increment_rate_limit(rate_limit_key)
+    current_requests = await redis_manager.sliding_window_check(source_system.value, 50)
     
     if current_requests > 50:  # 50 registration requests per minute per system
         raise HTTPException(
@@ -89,34 +87,12 @@ async def get_hash_stats():
     total hashes, matches found, and system activity.
     """
     try:
-        # Get cached stats first
-        cached_stats = await redis_manager.get("system_stats")
+        # Cached stats are stored as encoded JSON, serve them without re-serializing
+        cached_stats = await redis_manager.get_raw("system_stats")
         if cached_stats:
-            return cached_stats
+            return Response(content=cached_stats, media_type="application/json")
         
-        # Query database for fresh stats
-        from app.core.database import db_manager
-        
-        # Total hashes by system
-        total_result = db_manager.supabase.table("hash_registry").select("source_system", count="exact").execute()
-
-        
-        # Recent matches (last 24 hours)
-        from datetime import datetime, timedelta
-        yesterday = (datetime.utcnow() - timedelta(days=1)).isoformat()
-        recent_matches = db_manager.supabase.table('hash_matches').select('*').gte('detected_at', yesterday).execute()
-        
-        stats = {
-            "total_hashes": total_result.count,
-            "recent_matches": len(recent_matches.data),
-            "systems_connected": len(set(row['source_system'] for row in total_result.data)),
-            "last_updated": datetime.utcnow().isoformat()
-        }
-        
-        # Cache for 5 minutes
-        await redis_manager.set("system_stats", stats, expire=300)
-        
-        return stats
+        return await hash_service.compute_hash_stats(use_cache=False)
         
     except Exception as e:
         raise HTTPException(
@@ -1,66 +1,91 @@
 from fastapi import APIRouter, HTTPException
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
+import asyncio
+import time
 
 from app.core.database import db_manager
 from app.core.redis import redis_manager
+from app.utils.constants import HEALTH_CACHE_TTL
 
 router = APIRouter()
 
-@router.get("/health")
-async def health_check():
-    """
-    System health check
-    
-    Returns the health status of all system components including
-    database, Redis, and external service connectivity.
-    """
-    
-    health_status = {
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "version": "1.0.0",
-        "components": {}
-    }
-    
-    # Check database connectivity
+# Last healthy report, reused for a few seconds so frequent
+# load balancer probes don't each hit the database and Redis
+_last_health: Dict[str, Any] = {"t": 0.0, "payload": None}
+
+def _cached_health() -> Optional[Dict[str, Any]]:
+    """Return the last healthy report if it is still fresh"""
+    if _last_health["payload"] and time.monotonic() - _last_health["t"] < HEALTH_CACHE_TTL:
+        return _last_health["payload"]
+    return None
+
+async def _check_db() -> Dict[str, Any]:
+    """Probe database connectivity"""
     try:
         db_healthy = await db_manager.health_check()
-        health_status["components"]["database"] = {
+        return {
             "status": "healthy" if db_healthy else "unhealthy",
             "type": "supabase"
         }
     except Exception as e:
-        health_status["components"]["database"] = {
+        return {
             "status": "unhealthy",
             "type": "supabase",
             "error": str(e)
         }
-        health_status["status"] = "degraded"
-    
-    # Check Redis connectivity
+
+async def _check_redis() -> Dict[str, Any]:
+    """Probe Redis connectivity"""
     try:
-        await redis_manager.connect()
-        test_key = "health_check_test"
-        await redis_manager.set(test_key, "test_value", expire=10)
-        test_value = await redis_manager.get(test_key)
-        await redis_manager.delete(test_key)
-        
-        redis_healthy = test_value == "test_value"
-        health_status["components"]["redis"] = {
+        redis_healthy = await redis_manager.ping()
+        return {
             "status": "healthy" if redis_healthy else "unhealthy",
             "type": "redis"
         }
-        
-        if not redis_healthy:
-            health_status["status"] = "degraded"
-            
     except Exception as e:
-        health_status["components"]["redis"] = {
+        return {
             "status": "unhealthy",
             "type": "redis",
             "error": str(e)
         }
+
+async def collect_health_status() -> Dict[str, Any]:
+    """Probe all system components and return the health report"""
+    
+    cached = _cached_health()
+    if cached:
+        return cached
+    
+    # Components are independent, probe them concurrently
+    database, redis = await asyncio.gather(_check_db(), _check_redis())
+    components = {"database": database, "redis": redis}
+    
+    health_status = {
+        "status": "healthy",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "version": "1.0.0",
+        "components": components
+    }
+    
+    if any(c["status"] != "healthy" for c in components.values()):
         health_status["status"] = "degraded"
+    else:
+        _last_health["t"] = time.monotonic()
+        _last_health["payload"] = health_status
+    
+    return health_status
+
+@router.get("/health")
+async def health_check():
+    """
+    System health check
+    
+    Returns the health status of all system components including
+    database, Redis, and external service connectivity.
+    """
+    
+    health_status = await collect_health_status()
     
     # Overall system status
     if health_status["status"] == "healthy":
@@ -77,13 +102,17 @@ async def readiness_check():
     """
     
     try:
+        # A recent healthy probe already proves the essential services are up
+        if _cached_health():
+            return {"status": "ready", "timestamp": datetime.now(timezone.utc).isoformat()}
+        
         # Quick checks for essential services
         db_healthy = await db_manager.health_check()
         
         if not db_healthy:
             raise HTTPException(status_code=503, detail="Database not ready")
         
-        return {"status": "ready", "timestamp": datetime.utcnow().isoformat()}
+        return {"status": "ready", "timestamp": datetime.now(timezone.utc).isoformat()}
         
         
     except Exception as e:
@@ -71,24 +71,15 @@ async def get_subscription(system_id: str):
     """Get current webhook subscription for a system"""
     
     try:
-        from app.core.database import db_manager
+        subscription = await notification_service.get_subscription(system_id)
         
-        result = db_manager.supabase.table('webhook_subscriptions').select('*').eq('system_id', system_id).eq('active', True).execute()
-        
-        if not result.data:
+        if not subscription:
             raise HTTPException(
                 status_code=404,
                 detail="No active subscription found for this system"
             )
         
-        subscription = result.data[0]
-        return {
-            "system_id": subscription["system_id"],
-            "webhook_url": subscription["webhook_url"],
-            "notification_types": subscription["notification_types"],
-            "filters": subscription["filters"],
-            "created_at": subscription["created_at"]
-        }
+        return subscription
         
     except HTTPException:
         raise
@@ -103,14 +94,7 @@ async def unsubscribe_webhook(system_id: str):
     """Unsubscribe from webhook notifications"""
     
     try:
-        from app.core.database import db_manager
-        from app.core.redis import redis_manager
-        
-        # Deactivate subscription
-        result = db_manager.supabase.table('webhook_subscriptions').update({"active": False}).eq('system_id', system_id).execute()
-        
-        # Remove from cache
-        await redis_manager.delete(f"webhook:{system_id}")
+        await notification_service.unsubscribe_webhook(system_id)
         
         return {"success": True, "message": "Webhook subscription removed successfully"}
         
@@ -125,18 +109,14 @@ async def get_notification_queue_status():
     """Get status of the notification queue"""
     
     try:
-        from app.core.database import db_manager
-        
-        # Get queue statistics
-        pending = db_manager.supabase.table('notification_queue').select('id', count="exact").eq('status', 'pending').execute()
-        failed = db_manager.supabase.table('notification_queue').select('id', count="exact").eq('status', 'failed').execute()
-        sent = db_manager.supabase.table('notification_queue').select('id', count="exact").eq('status', 'sent').execute()
+        # Get queue statistics from the maintained per-status counters
+        counts = await notification_service.get_queue_counts()
         
         return {
-            "pending": pending.count,
-            "failed": failed.count,
-            "sent": sent.count,
-            "total": pending.count + failed.count + sent.count
+            "pending": counts.get("pending", 0),
+            "failed": counts.get("failed", 0),
+            "sent": counts.get("sent", 0),
+            "total": sum(counts.values())
         }
         
     except Exception as e:
@@ -1,3 +1,4 @@
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings
 from typing import Optional, List
 import secrets
@@ -12,7 +13,7 @@ class Settings(BaseSettings):
     redis_url: str = "redis://localhost:6379/0"
     
     # Security
-    secret_key: str = secrets.token_urlsafe(32)
+    secret_key: str = Field(default_factory=lambda: secrets.token_urlsafe(32))
     access_token_expire_minutes: int = 30
     algorithm: str = "HS256"
     
@@ -43,5 +44,12 @@ class Settings(BaseSettings):
 
     class Config:
         env_file = ".env"
+    
+    @model_validator(mode="after")
+    def require_secret_key_in_production(self):
+        # A generated key differs per worker process, so tokens would not verify across them
+        if self.environment == "production" and "secret_key" not in self.model_fields_set:
+            raise ValueError("SECRET_KEY must be set in production")
+        return self
 
 settings = Settings()
\ No newline at end of file
@@ -1,11 +1,32 @@
+import logging
 from supabase import create_client, Client
+from postgrest.utils import SyncClient
 from typing import Optional
 import asyncio
+import httpx
 
 from app.core.config import settings
 
-# Supabase client
+logger = logging.getLogger(__name__)
+
+def _pooled_postgrest_session(client: Client) -> SyncClient:
+    """Build a keep-alive HTTP/2 session to replace the PostgREST default"""
+    session = client.postgrest.session
+    transport = httpx.HTTPTransport(
+        http2=True,
+        retries=1,
+        limits=httpx.Limits(max_keepalive_connections=32, keepalive_expiry=60)
+    )
+    return SyncClient(
+        base_url=session.base_url,
+        headers=session.headers,
+        timeout=10,
+        transport=transport
+    )
+
+# Supabase client; queries run from worker threads share one pooled session
 supabase: Client = create_client(settings.supabase_url, settings.supabase_key)
+supabase.postgrest.session = _pooled_postgrest_session(supabase)
 
 class DatabaseManager:
     def __init__(self):
@@ -14,10 +35,12 @@ class DatabaseManager:
     async def health_check(self) -> bool:
         """Check database connectivity"""
         try:
-            result = self.supabase.table('hash_registry').select("count", count='exact').limit(1).execute()
+            result = await asyncio.to_thread(
+                lambda: self.supabase.table('hash_registry').select("count", count='exact').limit(1).execute()
+            )
             return True
         except Exception as e:
-            print(f"Database health check failed: {e}")
+            logger.warning("Database health check failed: %s", e)
             return False
     
     def get_client(self) -> Client:
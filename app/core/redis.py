@@ -1,22 +1,67 @@
 import redis.asyncio as redis
-import json
-from typing import Any, Optional, Union
+import asyncio
+import orjson
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Union
 from app.core.config import settings
 
+# Rolling-window limiter: drop expired entries, then admit the request
+# only while the window holds fewer than ARGV[1] entries
+SLIDING_WINDOW_LUA = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window)
+local count = redis.call('ZCARD', KEYS[1])
+if count < limit then
+    redis.call('ZADD', KEYS[1], now, ARGV[4])
+    redis.call('PEXPIRE', KEYS[1], window + 60000)
+end
+return count + 1
+"""
+
+# Leased queue pop: claim up to ARGV[2] members due by ARGV[1] and push
+# their score to the lease deadline ARGV[3], so an unfinished claim
+# becomes due again instead of being lost
+LEASE_DUE_LUA = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, member in ipairs(due) do
+    redis.call('ZADD', KEYS[1], ARGV[3], member)
+end
+return due
+"""
+
 class RedisManager:
     def __init__(self):
         self.redis_url = settings.redis_url
         self.redis_client: Optional[redis.Redis] = None
+        self.sliding_script = None
+        self.lease_script = None
+        self._connect_lock = asyncio.Lock()
     
     async def connect(self):
         """Initialize Redis connection"""
+        # Keep raw bytes, values are decoded once by orjson in get()
         self.redis_client = await redis.from_url(
             self.redis_url, 
-            encoding="utf-8", 
-            decode_responses=True
+            decode_responses=False
         )
+        # Scripts are invoked by SHA via EVALSHA. Load them up front so the first
+        # request doesn't pay the NOSCRIPT round-trip and full script upload.
+        self.sliding_script = self.redis_client.register_script(SLIDING_WINDOW_LUA)
+        self.lease_script = self.redis_client.register_script(LEASE_DUE_LUA)
+        for script in (self.sliding_script, self.lease_script):
+            await self.redis_client.script_load(script.script)
         return self.redis_client
     
+    async def _ensure_connected(self):
+        """Connect lazily, letting only one coroutine create the client"""
+        if not self.redis_client:
+            async with self._connect_lock:
+                if not self.redis_client:
+                    await self.connect()
+    
     async def disconnect(self):
         """Close Redis connection"""
         if self.redis_client:
@@ -24,44 +69,129 @@ class RedisManager:
     
     async def get(self, key: str) -> Optional[Any]:
         """Get value from Redis"""
-        if not self.redis_client:
-            await self.connect()
+        await self._ensure_connected()
         
         value = await self.redis_client.get(key)
-        if value:
+        if value is not None:
             try:
-                return json.loads(value)
-            except json.JSONDecodeError:
-                return value
+                return orjson.loads(value)
+            except orjson.JSONDecodeError:
+                return value.decode()
         return None
     
+    async def get_raw(self, key: str) -> Optional[bytes]:
+        """Get stored value as-is, without JSON decoding"""
+        await self._ensure_connected()
+        
+        return await self.redis_client.get(key)
+    
     async def set(self, key: str, value: Any, expire: Optional[int] = None) -> bool:
         """Set value in Redis"""
-        if not self.redis_client:
-            await self.connect()
+        await self._ensure_connected()
         
-        if not isinstance(value, str):
-            value = json.dumps(value)
+        if not isinstance(value, (bytes, str)):
+            value = orjson.dumps(value)
         
         result = await self.redis_client.set(key, value, ex=expire)
         return result
     
     async def delete(self, key: str) -> bool:
         """Delete key from Redis"""
-        if not self.redis_client:
-            await self.connect()
+        await self._ensure_connected()
         
         result = await self.redis_client.delete(key)
         return bool(result)
     
+    async def delete_many(self, keys: List[str]) -> int:
+        """Delete several keys with a single DEL"""
+        await self._ensure_connected()
+        
+        if not keys:
+            return 0
+        return await self.redis_client.delete(*keys)
+    
     async def exists(self, key: str) -> bool:
         """Check if key exists"""
-        if not self.redis_client:
-            await self.connect()
+        await self._ensure_connected()
         
         result = await self.redis_client.exists(key)
         return bool(result)
     
+    async def ping(self) -> bool:
+        """Check Redis liveness with a single read-only round-trip"""
+        await self._ensure_connected()
+        
+        return (await self.redis_client.ping()) is True
+    
+    async def get_hash_field(self, key: str, field: str) -> Optional[Any]:
+        """Get a JSON-encoded field from a Redis hash"""
+        await self._ensure_connected()
+        
+        value = await self.redis_client.hget(key, field)
+        return orjson.loads(value) if value is not None else None
+    
+    async def set_hash_field(self, key: str, field: str, value: Any):
+        """Store a value as a JSON-encoded field of a Redis hash"""
+        await self._ensure_connected()
+        
+        await self.redis_client.hset(key, field, orjson.dumps(value))
+    
+    async def get_hash_fields(self, key: str, fields: List[str]) -> Dict[str, Any]:
+        """Get several JSON-encoded fields from a Redis hash with one HMGET"""
+        await self._ensure_connected()
+        
+        if not fields:
+            return {}
+        values = await self.redis_client.hmget(key, fields)
+        return {
+            field: orjson.loads(value)
+            for field, value in zip(fields, values)
+            if value is not None
+        }
+    
+    async def set_hash_fields(self, key: str, values: Dict[str, Any]):
+        """Store several values as JSON-encoded fields of a Redis hash"""
+        await self._ensure_connected()
+        
+        if not values:
+            return
+        await self.redis_client.hset(
+            key, mapping={field: orjson.dumps(value) for field, value in values.items()}
+        )
+    
+    async def delete_hash_field(self, key: str, field: str) -> bool:
+        """Remove a field from a Redis hash"""
+        await self._ensure_connected()
+        
+        result = await self.redis_client.hdel(key, field)
+        return bool(result)
+    
+    async def increment_counters(self, key: str, deltas: Dict[str, int]):
+        """Apply several HINCRBY updates to a counter hash in one round-trip"""
+        await self._ensure_connected()
+        
+        pipe = self.redis_client.pipeline(transaction=False)
+        for field, delta in deltas.items():
+            pipe.hincrby(key, field, delta)
+        await pipe.execute()
+    
+    async def get_counters(self, key: str) -> Dict[str, int]:
+        """Get all fields of a counter hash"""
+        await self._ensure_connected()
+        
+        raw = await self.redis_client.hgetall(key)
+        return {field.decode(): int(value) for field, value in raw.items()}
+    
+    async def replace_counters(self, key: str, counts: Dict[str, int]):
+        """Overwrite a counter hash with freshly computed values"""
+        await self._ensure_connected()
+        
+        pipe = self.redis_client.pipeline()
+        pipe.delete(key)
+        if counts:
+            pipe.hset(key, mapping=counts)
+        await pipe.execute()
+    
     async def cache_hash_lookup(self, hash_value: str, result: dict, expire: int = 300):
         """Cache hash lookup result for 5 minutes"""
         cache_key = f"hash_lookup:{hash_value}"
@@ -72,17 +202,62 @@ class RedisManager:
         cache_key = f"hash_lookup:{hash_value}"
         return await self.get(cache_key)
     
-    async def increment_rate_limit(self, identifier: str, window: int = 60) -> int:
-        """Increment rate limit counter"""
-        if not self.redis_client:
-            await self.connect()
+    async def mget_cached_hash_lookup(self, hash_values: List[str]) -> Dict[str, dict]:
+        """Get cached lookup results for many hashes in one MGET, keyed by hash"""
+        await self._ensure_connected()
         
-        key = f"rate_limit:{identifier}"
-        pipe = self.redis_client.pipeline()
-        await pipe.incr(key)
-        await pipe.expire(key, window)
-        results = await pipe.execute()
-        return results[0]
+        if not hash_values:
+            return {}
+        
+        values = await self.redis_client.mget([f"hash_lookup:{h}" for h in hash_values])
+        return {
+            hash_value: orjson.loads(value)
+            for hash_value, value in zip(hash_values, values)
+            if value is not None
+        }
+    
+    async def cache_hash_lookups(self, results: Dict[str, dict], expire: int = 300):
+        """Cache many hash lookup results in one pipelined round-trip"""
+        await self._ensure_connected()
+        
+        pipe = self.redis_client.pipeline(transaction=False)
+        for hash_value, result in results.items():
+            pipe.setex(f"hash_lookup:{hash_value}", expire, orjson.dumps(result))
+        await pipe.execute()
+    
+    async def sliding_window_check(self, identifier: str, limit: int, window_ms: int = 60000) -> int:
+        """Count a request against a rolling window, returns the request's position in it"""
+        await self._ensure_connected()
+        
+        key = f"rate_window:{identifier}"
+        now_ms = int(time.time() * 1000)
+        return await self.sliding_script(
+            keys=[key],
+            args=[limit, window_ms, now_ms, uuid.uuid4().hex]
+        )
+
+    async def schedule_members(self, key: str, members: Dict[str, float], nx: bool = False):
+        """Add members to a sorted-set queue, scored by when they are due.
+        With nx, members already queued keep their current score."""
+        await self._ensure_connected()
+        
+        if members:
+            await self.redis_client.zadd(key, members, nx=nx)
+    
+    async def lease_due_members(self, key: str, limit: int, lease_seconds: float) -> List[str]:
+        """Claim due members of a sorted-set queue for lease_seconds"""
+        await self._ensure_connected()
+        
+        now = time.time()
+        members = await self.lease_script(keys=[key], args=[now, limit, now + lease_seconds])
+        return [member.decode() for member in members]
+    
+    async def remove_members(self, key: str, members: List[str]):
+        """Remove members from a sorted-set queue"""
+        await self._ensure_connected()
+        
+        if members:
+            await self.redis_client.zrem(key, *members)
 
 redis_manager = RedisManager()
 
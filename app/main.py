@@ -1,22 +1,30 @@
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
 import time
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from pathlib import Path
 
 from app.core.config import settings
+from app.core.logging import setup_logging
 from app.core.redis import redis_manager
+from app.services.audit_service import audit_service
+from app.services.notification_service import notification_service
 from app.api.v1.api import api_router
 
+setup_logging()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     await redis_manager.connect()
     yield
     # Shutdown
+    await audit_service.flush()
+    await notification_service.close()
     await redis_manager.disconnect()
 
 # Create FastAPI application
@@ -26,6 +34,7 @@ app = FastAPI(
     description="Hash Intelligence Sharing API for Child Safety Systems",
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -38,6 +47,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses (dashboard chart payloads)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Add trusted host middleware for production
 if settings.environment == "production":
     app.add_middleware(
@@ -66,7 +78,9 @@ async def rate_limiting_middleware(request: Request, call_next):
     client_id = request.client.host
     
     # Check rate limit
-    current_requests = await redis_manager.increment_rate_limit(f"global:{client_id}")
+    current_requests = await redis_manager.sliding_window_check(
+        f"global:{client_id}", settings.rate_limit_per_minute
+    )
     
     if current_requests > settings.rate_limit_per_minute:
         raise HTTPException(
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, validator
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, Field, StringConstraints
+from typing import Annotated, List, Optional, Dict, Any
 from enum import Enum
 from datetime import datetime
 import uuid
@@ -20,34 +20,24 @@ class SeverityLevel(str, Enum):
     HIGH = "high"
     CRITICAL = "critical"
 
+# Stripped, lower-cased hash value; cleaned and length-checked by pydantic-core
+HashValue = Annotated[
+    str,
+    StringConstraints(strip_whitespace=True, to_lower=True, min_length=8, max_length=64)
+]
+
 class HashRegisterRequest(BaseModel):
-    hash_value: str = Field(..., min_length=8, max_length=64)
+    hash_value: HashValue
     hash_type: HashType
     source_id: str = Field(..., min_length=1, max_length=255)
     severity: SeverityLevel = SeverityLevel.MEDIUM
     tags: Optional[List[str]] = None
     metadata: Optional[Dict[str, Any]] = None
-    
-    @validator('hash_value')
-    def validate_hash_value(cls, v):
-        # Remove any whitespace and convert to lowercase
-        return v.strip().lower()
 
 class HashLookupRequest(BaseModel):
-    hashes: List[str] = Field(..., min_items=1, max_items=100)
+    hashes: List[HashValue] = Field(..., min_length=1, max_length=100)
     source_system: SourceSystem
     include_metadata: bool = False
-    
-    @validator('hashes')
-    def validate_hashes(cls, v):
-        # Clean and validate each hash
-        cleaned_hashes = []
-        for hash_val in v:
-            cleaned = hash_val.strip().lower()
-            if len(cleaned) < 8 or len(cleaned) > 64:
-                raise ValueError(f"Hash {cleaned} must be between 8 and 64 characters")
-            cleaned_hashes.append(cleaned)
-        return cleaned_hashes
 
 class HashMatch(BaseModel):
     hash: str
@@ -1,12 +1,22 @@
+import logging
+import asyncio
 import uuid
-from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 from app.core.database import db_manager
+from app.utils.constants import AUDIT_LOG_BUFFER_SIZE, AUDIT_LOG_BUFFER_TIME
+from app.utils.helpers import utc_now_iso
+
+logger = logging.getLogger(__name__)
+
+# Queued by flush() behind the pending records to tell the flusher to finish up
+_STOP = object()
 
 class AuditService:
     def __init__(self):
         self.db = db_manager
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._flush_task: Optional[asyncio.Task] = None
     
     async def log_action(
         self,
@@ -18,23 +28,83 @@ class AuditService:
     ):
         """Log an action for audit purposes"""
         
-        try:
-            audit_record = {
-                "id": str(uuid.uuid4()),
-                "action": action,
-                "system_id": system_id,
-                "user_id": user_id,
-                "resource_id": resource_id,
-                "details": details or {},
-                "timestamp": datetime.utcnow().isoformat()
-            }
+        audit_record = {
+            "id": str(uuid.uuid4()),
+            "action": action,
+            "system_id": system_id,
+            "user_id": user_id,
+            "resource_id": resource_id,
+            "details": details or {},
+            "timestamp": utc_now_iso()
+        }
+        
+        # Buffer the record; the background flusher writes it in a batch
+        self._queue.put_nowait(audit_record)
+        
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flusher())
+    
+    async def _flusher(self):
+        """Write buffered audit records in batches"""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            record = await self._queue.get()
+            if record is _STOP:
+                return
             
-            # Insert into audit log table
-            self.db.supabase.table('audit_log').insert(audit_record).execute()
+            batch = [record]
+            deadline = loop.time() + AUDIT_LOG_BUFFER_TIME
+            stopping = False
             
-        except Exception as e:
+            # Collect until the batch is full or the buffer window closes
+            while len(batch) < AUDIT_LOG_BUFFER_SIZE:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    record = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if record is _STOP:
+                    stopping = True
+                    break
+                batch.append(record)
+            
+            # The partial batch is always written, including on shutdown
+            await self._insert_batch(batch)
+            if stopping:
+                return
+    
+    async def _insert_batch(self, batch: List[Dict[str, Any]]):
+        """Insert a batch of audit records"""
+        try:
+            await asyncio.to_thread(
+                lambda: self.db.supabase.table('audit_log').insert(batch).execute()
+            )
+        except Exception:
             # Don't fail the main operation if audit logging fails
-            print(f"Audit logging failed: {e}")
+            logger.exception("Audit logging failed")
+    
+    async def flush(self):
+        """Stop the flusher and write any buffered records"""
+        # The stop marker queues behind every pending record, so the flusher
+        # writes its in-flight batch and the rest of the queue before exiting
+        if self._flush_task is not None and not self._flush_task.done():
+            self._queue.put_nowait(_STOP)
+            await self._flush_task
+        self._flush_task = None
+        
+        # Anything logged while the flusher was finishing up
+        batch = []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+            if len(batch) >= AUDIT_LOG_BUFFER_SIZE:
+                await self._insert_batch(batch)
+                batch = []
+        
+        if batch:
+            await self._insert_batch(batch)
     
     async def get_audit_logs(
         self,
@@ -53,12 +123,14 @@ class AuditService:
             if action:
                 query = query.eq('action', action)
             
-            result = query.order('timestamp', desc=True).limit(limit).execute()
+            result = await asyncio.to_thread(
+                lambda: query.order('timestamp', desc=True).limit(limit).execute()
+            )
             
             return result.data
             
-        except Exception as e:
-            print(f"Error retrieving audit logs: {e}")
+        except Exception:
+            logger.exception("Error retrieving audit logs")
             return []
 
 audit_service = AuditService()
\ No newline at end of file
@@ -1,7 +1,8 @@
+import logging
+import asyncio
 import time
-import uuid
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 from app.core.database import db_manager
 from app.core.redis import redis_manager
@@ -9,6 +10,10 @@ from app.schemas.hash_schemas import (
     HashRegisterRequest, HashLookupRequest, HashLookupResponse, 
     HashRegisterResponse, HashMatch
 )
+from app.utils.constants import HASH_LOOKUP_CACHE_TTL
+from app.utils.helpers import bulk_uuid4, utc_now_iso
+
+logger = logging.getLogger(__name__)
 
 class HashService:
     def __init__(self):
@@ -21,46 +26,81 @@ class HashService:
         matches = []
         cached_results = 0
         
+        # Check cache first, all hashes in one round-trip
+        cached = await self.redis.mget_cached_hash_lookup(request.hashes)
+        misses = [h for h in dict.fromkeys(request.hashes) if h not in cached]
+        
+        # Query database once for every cache miss, then cache the results
+        fetched = {}
+        if misses:
+            fetched = await self._query_hashes_from_db(misses, request.include_metadata)
+            await self.redis.cache_hash_lookups(fetched, expire=HASH_LOOKUP_CACHE_TTL)
+        
+        # Preserve request order
         for hash_value in request.hashes:
-            # Check cache first
-            cached_result = await self.redis.get_cached_hash_lookup(hash_value)
-            
-            if cached_result:
-                matches.append(HashMatch(**cached_result))
+            if hash_value in cached:
+                matches.append(cached[hash_value])
                 cached_results += 1
             else:
-                # Query database
-                match_result = await self._query_hash_from_db(
-                    hash_value, request.include_metadata
-                )
-                matches.append(match_result)
-                
-                # Cache the result
-                await self.redis.cache_hash_lookup(
-                    hash_value, match_result.dict()
-                )
+                matches.append(fetched[hash_value])
         
         query_time = time.time() - start_time
         
-        return HashLookupResponse(
-            matches=matches,
-            total_matches=sum(1 for m in matches if m.found),
+        # Matches are plain dicts we built ourselves, so wrap them without validation
+        return HashLookupResponse.model_construct(
+            matches=[HashMatch.model_construct(**match) for match in matches],
+            total_matches=sum(1 for match in matches if match["found"]),
             query_time=query_time,
             cached=cached_results > 0
         )
     
-    async def _query_hash_from_db(self, hash_value: str, include_metadata: bool = False) -> HashMatch:
-        """Query single hash from database"""
+    async def compute_hash_stats(self, use_cache: bool = True) -> Dict[str, Any]:
+        """Compute registry statistics, served from cache when fresh"""
+        # Get cached stats first
+        if use_cache:
+            cached_stats = await self.redis.get("system_stats")
+            if cached_stats:
+                return cached_stats
+        
+        # Total hashes, connected systems and recent matches (last 24 hours).
+        # The Supabase client is blocking, so run the queries off the event loop.
+        # Only the exact count is needed from hash_registry, so fetch a single row.
+        now = datetime.now(timezone.utc)
+        yesterday = (now - timedelta(days=1)).isoformat()
+        total_result, systems_result, recent_matches = await asyncio.gather(
+            asyncio.to_thread(
+                lambda: self.db.supabase.table("hash_registry").select("id", count="exact").limit(1).execute()
+            ),
+            asyncio.to_thread(
+                lambda: self.db.supabase.rpc("distinct_source_systems").execute()
+            ),
+            asyncio.to_thread(
+                lambda: self.db.supabase.table('hash_matches').select('*').gte('detected_at', yesterday).execute()
+            )
+        )
+        
+        stats = {
+            "total_hashes": total_result.count,
+            "recent_matches": len(recent_matches.data),
+            "systems_connected": len(systems_result.data),
+            "last_updated": now.isoformat()
+        }
+        
+        # Cache for 5 minutes
+        await self.redis.set("system_stats", stats, expire=300)
+        
+        return stats
+    
+    async def _query_hashes_from_db(self, hash_values: List[str], include_metadata: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Query many hashes from database in a single request, keyed by hash"""
         try:
             # Query Supabase
-            query = self.db.supabase.table('hash_registry').select('*').eq('hash_value', hash_value)
-            result = query.execute()
-            
-            if not result.data:
-                return HashMatch(hash=hash_value, found=False)
+            result = await asyncio.to_thread(
+                lambda: self.db.supabase.table('hash_registry').select('*').in_('hash_value', hash_values).execute()
+            )
             
-            # Process sources
-            sources = []
+            # Process sources, grouped by hash
+            sources_by_hash: Dict[str, List[Dict[str, Any]]] = {}
             for record in result.data:
                 source_data = {
                     "system": record["source_system"],
@@ -75,52 +115,78 @@ class HashService:
                 if record.get("tags"):
                     source_data["tags"] = record["tags"]
                 
-                sources.append(source_data)
+                sources_by_hash.setdefault(record["hash_value"], []).append(source_data)
             
-            return HashMatch(
-                hash=hash_value,
-                found=True,
-                sources=sources
-            )
+            return {
+                hash_value: self._match_dict(hash_value, sources_by_hash.get(hash_value, []))
+                for hash_value in hash_values
+            }
             
-        except Exception as e:
-            print(f"Hash lookup error: {e}")
-            return HashMatch(hash=hash_value, found=False)
+        except Exception:
+            logger.exception("Hash lookup error")
+            return {hash_value: self._match_dict(hash_value, []) for hash_value in hash_values}
+    
+    @staticmethod
+    def _match_dict(hash_value: str, sources: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Lookup result in the HashMatch field layout"""
+        return {
+            "hash": hash_value,
+            "found": bool(sources),
+            "sources": sources,
+            "confidence_score": None,
+            "match_type": None
+        }
     
     async def register_hashes(self, hashes: List[HashRegisterRequest], source_system: str) -> HashRegisterResponse:
         """Register multiple hashes in the system"""
-        registered_count = 0
         errors = []
         hash_ids = []
         
-        for hash_request in hashes:
+        ids = bulk_uuid4(len(hashes))
+        rows = [
+            self._build_row(hash_request, source_system, hash_id)
+            for hash_request, hash_id in zip(hashes, ids)
+        ]
+        
+        if rows:
             try:
-                # Create new hash entry
-                hash_id = await self._create_new_hash_entry(hash_request, source_system)
-                
-                if hash_id:
-                    hash_ids.append(hash_id)
-                    registered_count += 1
-                    
-                    # Invalidate cache for this hash
-                    await self.redis.delete(f"hash_lookup:{hash_request.hash_value}")
+                # Insert all rows in one request
+                result = await asyncio.to_thread(
+                    lambda: self.db.supabase.table('hash_registry').insert(rows).execute()
+                )
+                hash_ids = [row["id"] for row in result.data]
                 
             except Exception as e:
-                error_msg = f"Failed to register hash {hash_request.hash_value}: {str(e)}"
-                errors.append(error_msg)
+                logger.warning("Batch hash insert failed, retrying per row: %s", e)
+                
+                # Fall back to per-row inserts so one bad row doesn't reject the rest
+                for row in rows:
+                    try:
+                        result = await asyncio.to_thread(
+                            lambda row=row: self.db.supabase.table('hash_registry').insert(row).execute()
+                        )
+                        if result.data:
+                            hash_ids.append(row["id"])
+                    except Exception as row_error:
+                        error_msg = f"Failed to register hash {row['hash_value']}: {str(row_error)}"
+                        errors.append(error_msg)
+        
+        # Invalidate cache for every registered hash in one round-trip
+        registered = set(hash_ids)
+        await self.redis.delete_many(
+            [f"hash_lookup:{row['hash_value']}" for row in rows if row["id"] in registered]
+        )
         
         return HashRegisterResponse(
             success=len(errors) == 0,
-            registered_count=registered_count,
+            registered_count=len(hash_ids),
             errors=errors,
             hash_ids=hash_ids
         )
     
-    async def _create_new_hash_entry(self, hash_request: HashRegisterRequest, source_system: str) -> Optional[str]:
-        """Create a new hash entry in the database"""
-        hash_id = str(uuid.uuid4())
-        
-        data = {
+    def _build_row(self, hash_request: HashRegisterRequest, source_system: str, hash_id: str) -> Dict[str, Any]:
+        """Build the hash_registry row for a registration request"""
+        return {
             "id": hash_id,
             "hash_value": hash_request.hash_value,
             "hash_type": hash_request.hash_type.value,
@@ -129,17 +195,7 @@ class HashService:
             "severity_level": hash_request.severity.value,
             "tags": hash_request.tags or [],
             "metadata": hash_request.metadata or {},
-            "created_at": datetime.utcnow().isoformat()
+            "created_at": utc_now_iso()
         }
-        
-        try:
-            result = self.db.supabase.table('hash_registry').insert(data).execute()
-            
-            if result.data:
-                return hash_id
-            return None
-        except Exception as e:
-            print(f"Error creating hash entry: {e}")
-            return None
 
 hash_service = HashService()
\ No newline at end of file
@@ -1,12 +1,36 @@
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Tuple
+
+# Notification templates per language, built once at import
+_RAW_TEMPLATES: Dict[str, Dict[str, str]] = {
+    "en": {
+        "hash_match": "🚨 ALERT: Hash {hash} detected on {system} - Case #{case_id}",
+        "critical_match": "🔴 CRITICAL: High-risk hash {hash} found - Immediate action required"
+    },
+    "es": {
+        "hash_match": "🚨 ALERTA: Hash {hash} detectado en {system} - Caso #{case_id}",
+        "critical_match": "🔴 CRÍTICO: Hash de alto riesgo {hash} encontrado - Acción inmediata requerida"
+    }
+}
+
+# Flattened (language, key) -> template lookup
+_TEMPLATES: Dict[Tuple[str, str], str] = {
+    (lang, key): template
+    for lang, templates in _RAW_TEMPLATES.items()
+    for key, template in templates.items()
+}
+
+@lru_cache(maxsize=64)
+def get_template(lang: str, key: str) -> str:
+    """Get the template for a language and message key"""
+    return _TEMPLATES[(lang, key)]
+
 class MultilingualService:
     def __init__(self):
-        self.templates = {
-            "en": {
-                "hash_match": "🚨 ALERT: Hash {hash} detected on {system} - Case #{case_id}",
-                "critical_match": "🔴 CRITICAL: High-risk hash {hash} found - Immediate action required"
-            },
-            "es": {
-                "hash_match": "🚨 ALERTA: Hash {hash} detectado en {system} - Caso #{case_id}",
-                "critical_match": "🔴 CRÍTICO: Hash de alto riesgo {hash} encontrado - Acción inmediata requerida"
-            }
-        }
+        self.templates = _RAW_TEMPLATES
+
+    def format_message(self, lang: str, key: str, data: Mapping[str, Any]) -> str:
+        """Render a notification message in the given language"""
+        return get_template(lang, key).format_map(data)
+
+multilingual_service = MultilingualService()
@@ -1,12 +1,40 @@
+import logging
+import asyncio
+import hmac
+import time
 import uuid
-import json
 import httpx
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+import orjson
+from typing import Dict, Any, List, Optional, Set
 
 from app.core.database import db_manager
 from app.core.redis import redis_manager
 from app.core.config import settings
+from app.utils.constants import (
+    NOTIFICATION_BATCH_SIZE, NOTIFICATION_LEASE_TIMEOUT, NOTIFICATION_RETRY_DELAY,
+    NOTIFICATION_TIMEOUT, QUEUE_COUNTS_RESYNC_INTERVAL, WEBHOOK_MAX_CONCURRENCY
+)
+from app.utils.helpers import utc_now_iso
+
+logger = logging.getLogger(__name__)
+
+# Redis hash of notification counts per status, kept in step with the queue
+QUEUE_COUNTS_KEY = "notification_queue_counts"
+QUEUE_COUNTS_SYNC_KEY = "notification_queue_counts:synced"
+
+# Redis hash of active webhook subscriptions keyed by system_id
+WEBHOOK_SUBSCRIPTIONS_KEY = "webhook_subs"
+
+# Redis sorted set of notification ids scored by when delivery is due
+NOTIFICATION_QUEUE_KEY = "notification_q"
+
+# Systems that can receive notifications, and severities that notify all of them
+_ALL_SYSTEMS = frozenset({"trace", "grapnel", "takedown"})
+_HIGH_SEVERITIES = frozenset({"high", "critical"})
+
+# Webhook signing key, encoded once, and a keyed HMAC to copy per signature
+_SECRET_BYTES = settings.webhook_secret.encode()
+_HMAC_PROTO = hmac.new(_SECRET_BYTES, digestmod='sha256')
 
 class NotificationService:
     def __init__(self):
@@ -17,6 +45,25 @@ class NotificationService:
             "grapnel": None,
             "takedown": None
         }
+        # Shared client so webhook deliveries reuse pooled connections,
+        # created on first use so it always belongs to a live process
+        self._http: Optional[httpx.AsyncClient] = None
+        self._send_semaphore = asyncio.Semaphore(WEBHOOK_MAX_CONCURRENCY)
+    
+    def _get_http(self) -> httpx.AsyncClient:
+        """Get the shared webhook HTTP client, creating it if needed"""
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=NOTIFICATION_TIMEOUT,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+            )
+        return self._http
+    
+    async def close(self):
+        """Close the shared webhook HTTP client"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
     
     async def subscribe_webhook(self, system_id: str, webhook_url: str, notification_types: List[str], filters: Dict[str, Any] = None) -> bool:
         """Subscribe a system to webhook notifications"""
@@ -28,23 +75,80 @@ class NotificationService:
                 "notification_types": notification_types,
                 "filters": filters or {},
                 "active": True,
-                "created_at": datetime.utcnow().isoformat()
+                "created_at": utc_now_iso()
             }
             
             # Store in database
-            result = self.db.supabase.table('webhook_subscriptions').upsert(subscription_data, on_conflict="system_id").execute()
+            result = await asyncio.to_thread(
+                lambda: self.db.supabase.table('webhook_subscriptions').upsert(subscription_data, on_conflict="system_id").execute()
+            )
             
             if result.data:
-                # Cache the webhook URL for quick access
-                await self.redis.set(f"webhook:{system_id}", webhook_url, expire=3600)  # Cache for 1 hour
+                # Cache the subscription for quick access
+                await self.redis.set_hash_field(
+                    WEBHOOK_SUBSCRIPTIONS_KEY, system_id, self._subscription_view(result.data[0])
+                )
                 return True
             
             return False
             
-        except Exception as e:
-            print(f"Error subscribing webhook: {e}")
+        except Exception:
+            logger.exception("Error subscribing webhook")
             return False
     
+    async def get_subscription(self, system_id: str) -> Optional[Dict[str, Any]]:
+        """Get the active webhook subscription for a system, cache first"""
+        cached = await self.redis.get_hash_field(WEBHOOK_SUBSCRIPTIONS_KEY, system_id)
+        if cached:
+            return cached
+        
+        result = await asyncio.to_thread(
+            lambda: self.db.supabase.table('webhook_subscriptions').select('*').eq('system_id', system_id).eq('active', True).execute()
+        )
+        
+        if not result.data:
+            return None
+        
+        subscription = self._subscription_view(result.data[0])
+        await self.redis.set_hash_field(WEBHOOK_SUBSCRIPTIONS_KEY, system_id, subscription)
+        return subscription
+    
+    async def get_subscriptions(self, system_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get active webhook subscriptions for several systems, cache first"""
+        subscriptions = await self.redis.get_hash_fields(WEBHOOK_SUBSCRIPTIONS_KEY, system_ids)
+        
+        missing = [system_id for system_id in system_ids if system_id not in subscriptions]
+        if missing:
+            result = await asyncio.to_thread(
+                lambda: self.db.supabase.table('webhook_subscriptions').select('*').in_('system_id', missing).eq('active', True).execute()
+            )
+            fetched = {row["system_id"]: self._subscription_view(row) for row in result.data}
+            
+            await self.redis.set_hash_fields(WEBHOOK_SUBSCRIPTIONS_KEY, fetched)
+            subscriptions.update(fetched)
+        
+        return subscriptions
+    
+    async def unsubscribe_webhook(self, system_id: str):
+        """Deactivate a system's webhook subscription"""
+        await asyncio.to_thread(
+            lambda: self.db.supabase.table('webhook_subscriptions').update({"active": False}).eq('system_id', system_id).execute()
+        )
+        
+        # Remove from cache
+        await self.redis.delete_hash_field(WEBHOOK_SUBSCRIPTIONS_KEY, system_id)
+    
+    @staticmethod
+    def _subscription_view(subscription: Dict[str, Any]) -> Dict[str, Any]:
+        """Public fields of a subscription row"""
+        return {
+            "system_id": subscription["system_id"],
+            "webhook_url": subscription["webhook_url"],
+            "notification_types": subscription["notification_types"],
+            "filters": subscription["filters"],
+            "created_at": subscription["created_at"]
+        }
+    
     async def send_hash_match_notification(self, match_data: Dict[str, Any]):
         """Send hash match notification to relevant systems"""
         try:
@@ -60,30 +164,25 @@ class NotificationService:
             # Process notifications asynchronously
             await self._process_notification_queue()
             
-        except Exception as e:
-            print(f"Error sending hash match notification: {e}")
+        except Exception:
+            logger.exception("Error sending hash match notification")
     
     async def _determine_notification_targets(self, match_data: Dict[str, Any]) -> List[str]:
         """Determine which systems should receive the notification"""
-        targets = []
+        targets: Set[str] = set()
         
         new_source = match_data.get("new_source_system")
         existing_source = match_data.get("existing_source_system")
         
         # Notify the system that originally reported the hash
-        if existing_source and existing_source not in targets:
-            targets.append(existing_source)
+        if existing_source:
+            targets.add(existing_source)
         
-        # Notify other relevant systems based on business rules
-        severity = match_data.get("severity", "medium")
-        if severity in ["high", "critical"]:
-            # High severity matches notify all systems
-            all_systems = ["trace", "grapnel", "takedown"]
-            for system in all_systems:
-                if system != new_source and system not in targets:
-                    targets.append(system)
+        # High severity matches notify all systems except the reporter
+        if match_data.get("severity", "medium") in _HIGH_SEVERITIES:
+            targets |= _ALL_SYSTEMS - {new_source}
         
-        return targets
+        return list(targets)
     
     async def _queue_notification(self, notification_id: str, target_system: str, notification_type: str, payload: Dict[str, Any]):
         """Queue a notification for delivery"""
@@ -94,12 +193,18 @@ class NotificationService:
             "notification_type": notification_type,
             "payload": payload,
             "status": "pending",
-            "created_at": datetime.utcnow().isoformat(),
+            "created_at": utc_now_iso(),
             "retry_count": 0
         }
         
         # Store in database
-        self.db.supabase.table('notification_queue').insert(notification_data).execute()
+        await asyncio.to_thread(
+            lambda: self.db.supabase.table('notification_queue').insert(notification_data).execute()
+        )
+        await self.redis.increment_counters(QUEUE_COUNTS_KEY, {"pending": 1})
+        
+        # Schedule delivery right away
+        await self.redis.schedule_members(NOTIFICATION_QUEUE_KEY, {notification_data["id"]: time.time()})
         
         # Also add to Redis queue for immediate processing
         await self.redis.set(
@@ -108,15 +213,52 @@ class NotificationService:
             expire=3600  # Expire after 1 hour
         )
     
-    async def _process_notification_queue(self):
-        """Process pending notifications"""
+    async def requeue_pending(self):
+        """Schedule pending notifications from Postgres that are missing from the queue"""
+        result = await asyncio.to_thread(
+            lambda: self.db.supabase.table('notification_queue').select('id').eq('status', 'pending').execute()
+        )
+        # NX leaves queued ids alone, so retry backoffs and other workers' leases survive
+        now = time.time()
+        await self.redis.schedule_members(
+            NOTIFICATION_QUEUE_KEY, {row["id"]: now for row in result.data}, nx=True
+        )
+    
+    async def _process_notification_queue(self) -> int:
+        """Process due notifications, returns how many were claimed"""
         try:
-            # Get pending notifications
-            result = self.db.supabase.table('notification_queue').select('*').eq('status', 'pending').limit(10).execute()
+            # Lease the due notifications, then load them in one query
+            ids = await self.redis.lease_due_members(
+                NOTIFICATION_QUEUE_KEY, NOTIFICATION_BATCH_SIZE, NOTIFICATION_LEASE_TIMEOUT
+            )
+            if not ids:
+                return 0
             
-            for notification in result.data:
-                success = await self._send_webhook_notification(notification)
-                
+            result = await asyncio.to_thread(
+                lambda: self.db.supabase.table('notification_queue').select('*').in_('id', ids).eq('status', 'pending').execute()
+            )
+            
+            # Claimed ids that are no longer pending have nothing left to deliver
+            loaded = {notification["id"] for notification in result.data}
+            done = [notification_id for notification_id in ids if notification_id not in loaded]
+            retries: Dict[str, float] = {}
+            
+            # Resolve webhook URLs for the whole batch up front
+            subscriptions = await self.get_subscriptions(
+                list({notification["target_system"] for notification in result.data})
+            )
+            url_map = {system_id: sub["webhook_url"] for system_id, sub in subscriptions.items()}
+            
+            # Deliver the batch concurrently
+            results = await asyncio.gather(*[
+                self._bounded_send(notification, url_map.get(notification["target_system"]))
+                for notification in result.data
+            ])
+            
+            updates = []
+            count_deltas: Dict[str, int] = {}
+            
+            for notification, success in zip(result.data, results):
                 # Update notification status
                 new_status = "sent" if success else "failed"
                 retry_count = notification.get("retry_count", 0)
@@ -124,74 +266,101 @@ class NotificationService:
                 if not success and retry_count < settings.max_retry_attempts:
                     new_status = "pending"
                     retry_count += 1
+                    retries[notification["id"]] = time.time() + NOTIFICATION_RETRY_DELAY * retry_count
+                else:
+                    done.append(notification["id"])
                 
-                update_data = {
+                # Upsert sends the full row, since its insert path checks NOT NULL columns
+                updates.append({
+                    **notification,
                     "status": new_status,
                     "retry_count": retry_count,
-                    "sent_at": datetime.utcnow().isoformat() if success else None
-                }
+                    "sent_at": utc_now_iso() if success else None
+                })
                 
-                self.db.supabase.table('notification_queue').update(update_data).eq('id', notification['id']).execute()
+                if new_status != "pending":
+                    count_deltas["pending"] = count_deltas.get("pending", 0) - 1
+                    count_deltas[new_status] = count_deltas.get(new_status, 0) + 1
+            
+            # Write every status change in one request
+            if updates:
+                await asyncio.to_thread(
+                    lambda: self.db.supabase.table('notification_queue').upsert(updates, on_conflict='id').execute()
+                )
+            
+            if count_deltas:
+                await self.redis.increment_counters(QUEUE_COUNTS_KEY, count_deltas)
+            
+            # Reschedule retries with backoff and drop finished notifications
+            await self.redis.schedule_members(NOTIFICATION_QUEUE_KEY, retries)
+            await self.redis.remove_members(NOTIFICATION_QUEUE_KEY, done)
+            
+            return len(ids)
                 
-        except Exception as e:
-            print(f"Error processing notification queue: {e}")
+        except Exception:
+            logger.exception("Error processing notification queue")
+            return 0
     
-    async def _send_webhook_notification(self, notification: Dict[str, Any]) -> bool:
+    async def get_queue_counts(self) -> Dict[str, int]:
+        """Get notification counts per status from the Redis counters"""
+        if await self.redis.exists(QUEUE_COUNTS_SYNC_KEY):
+            return await self.redis.get_counters(QUEUE_COUNTS_KEY)
+        
+        # Periodically rebuild the counters from Postgres to repair any drift
+        result = await asyncio.to_thread(
+            lambda: self.db.supabase.rpc('queue_status_counts').execute()
+        )
+        counts = {row["status"]: row["cnt"] for row in result.data}
+        
+        await self.redis.replace_counters(QUEUE_COUNTS_KEY, counts)
+        await self.redis.set(QUEUE_COUNTS_SYNC_KEY, "1", expire=QUEUE_COUNTS_RESYNC_INTERVAL)
+        
+        return counts
+    
+    async def _bounded_send(self, notification: Dict[str, Any], webhook_url: Optional[str]) -> bool:
+        """Send a webhook notification, limiting concurrent deliveries"""
+        async with self._send_semaphore:
+            return await self._send_webhook_notification(notification, webhook_url)
+    
+    async def _send_webhook_notification(self, notification: Dict[str, Any], webhook_url: Optional[str]) -> bool:
         """Send individual webhook notification"""
         try:
-            target_system = notification["target_system"]
-            
-            # Get webhook URL from cache or database
-            webhook_url = await self.redis.get(f"webhook:{target_system}")
-            
             if not webhook_url:
-                # Fetch from database
-                result = self.db.supabase.table('webhook_subscriptions').select('webhook_url').eq('system_id', target_system).eq('active', True).single().execute()
-                
-                if not result.data:
-                    return False
-                
-                webhook_url = result.data['webhook_url']
-                # Cache it
-                await self.redis.set(f"webhook:{target_system}", webhook_url, expire=3600)
+                return False
             
             # Prepare webhook payload
             webhook_payload = {
                 "event": notification["notification_type"],
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": utc_now_iso(),
                 "data": notification["payload"],
                 "notification_id": notification["id"]
             }
             
+            # Sign exactly the bytes that are sent
+            body = orjson.dumps(webhook_payload, option=orjson.OPT_SORT_KEYS)
+            
             # Send HTTP request
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    webhook_url,
-                    json=webhook_payload,
-                    headers={
-                        "Content-Type": "application/json",
-                        "X-Grapnel-Signature": self._generate_signature(webhook_payload)
-                    }
-                )
-                
-                return response.status_code == 200
-                
-        except Exception as e:
-            print(f"Error sending webhook notification: {e}")
+            response = await self._get_http().post(
+                webhook_url,
+                content=body,
+                headers={
+                    "Content-Type": "application/json",
+                    "X-Grapnel-Signature": self._generate_signature(body)
+                }
+            )
+            
+            return response.status_code == 200
+            
+        except Exception:
+            logger.exception("Error sending webhook notification")
             return False
     
-    def _generate_signature(self, payload: Dict[str, Any]) -> str:
+    def _generate_signature(self, payload: bytes) -> str:
         """Generate HMAC signature for webhook security"""
-        import hmac
-        import hashlib
-        
-        payload_str = json.dumps(payload, sort_keys=True)
-        signature = hmac.new(
-            settings.webhook_secret.encode(),
-            payload_str.encode(),
-            hashlib.sha256
-        ).hexdigest()
+        # Copying skips re-deriving the inner and outer pads from the key
+        signer = _HMAC_PROTO.copy()
+        signer.update(payload)
         
-        return f"sha256={signature}"
+        return f"sha256={signer.hexdigest()}"
 
 notification_service = NotificationService()
\ No newline at end of file
@@ -14,7 +14,18 @@ HASH_REGISTER_RATE_LIMIT = 50
 HASH_LOOKUP_CACHE_TTL = 300  # 5 minutes
 SYSTEM_STATS_CACHE_TTL = 300  # 5 minutes
 WEBHOOK_CACHE_TTL = 3600     # 1 hour
+HEALTH_CACHE_TTL = 2         # Reuse a healthy probe result briefly
 
 # Notification settings
 MAX_RETRY_ATTEMPTS = 3
-NOTIFICATION_TIMEOUT = 10    # seconds
\ No newline at end of file
+NOTIFICATION_TIMEOUT = 10    # seconds
+WEBHOOK_MAX_CONCURRENCY = 32  # concurrent webhook deliveries per batch
+NOTIFICATION_BATCH_SIZE = 10      # notifications claimed per pass
+NOTIFICATION_LEASE_TIMEOUT = 60   # seconds before an unfinished claim is retried
+NOTIFICATION_RETRY_DELAY = 30     # seconds, multiplied by the retry count
+NOTIFICATION_POLL_INTERVAL = 1    # seconds to wait when nothing is due
+QUEUE_COUNTS_RESYNC_INTERVAL = 60  # seconds between counter repairs from Postgres
+
+# Audit logging
+AUDIT_LOG_BUFFER_SIZE = 500  # max records per batched insert
+AUDIT_LOG_BUFFER_TIME = 1.0  # seconds to wait for a batch to fill
\ No newline at end of file
@@ -1,22 +1,51 @@
-import hashlib
 import hmac
-from typing import Any, Dict
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Tuple
 
 def generate_signature(payload: str, secret: str) -> str:
     """Generate HMAC signature for webhook security"""
     signature = hmac.new(
         secret.encode(),
         payload.encode(),
-        hashlib.sha256
+        'sha256'
     ).hexdigest()
     return f"sha256={signature}"
 
+# Hex digest lengths for fixed-size hash types
+_HEX_DIGEST_LENGTHS = {"SHA256": 64, "MD5": 32}
+
 def validate_hash(hash_value: str, hash_type: str) -> bool:
     """Validate hash format based on type"""
-    if hash_type.upper() == "SHA256":
-        return len(hash_value) == 64 and all(c in "0123456789abcdef" for c in hash_value.lower())
-    elif hash_type.upper() == "MD5":
-        return len(hash_value) == 32 and all(c in "0123456789abcdef" for c in hash_value.lower())
-    elif hash_type.upper() == "PHASH":
+    hash_type = hash_type.upper()
+    if hash_type == "PHASH":
         return len(hash_value) <= 64  # More flexible for perceptual hashes
-    return False
\ No newline at end of file
+    
+    expected = _HEX_DIGEST_LENGTHS.get(hash_type)
+    if expected is None or len(hash_value) != expected:
+        return False
+    
+    # bytes.fromhex validates in C; it skips whitespace, so check the decoded size too
+    try:
+        return len(bytes.fromhex(hash_value)) == expected // 2
+    except ValueError:
+        return False
+
+# (epoch second, ISO string) for the most recent utc_now_iso() call
+_ts_cache: Tuple[int, str] = (0, "")
+
+def utc_now_iso() -> str:
+    """Current UTC time as a naive ISO string, formatted at most once per second"""
+    global _ts_cache
+    now = int(time.time())
+    cached = _ts_cache
+    if cached[0] != now:
+        cached = (now, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now)))
+        _ts_cache = cached
+    return cached[1]
+
+def bulk_uuid4(n: int) -> List[str]:
+    """Generate n random UUID4 strings from a single os.urandom call"""
+    raw = os.urandom(16 * n)
+    return [str(uuid.UUID(bytes=raw[i:i + 16], version=4)) for i in range(0, 16 * n, 16)]
\ No newline at end of file
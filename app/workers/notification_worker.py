@@ -1,9 +1,14 @@
+import logging
 import asyncio
 import time
 from datetime import datetime
 
 from app.services.notification_service import notification_service
 from app.core.config import settings
+from app.core.logging import setup_logging
+from app.utils.constants import NOTIFICATION_POLL_INTERVAL
+
+logger = logging.getLogger(__name__)
 
 class NotificationWorker:
     def __init__(self):
@@ -12,20 +17,29 @@ class NotificationWorker:
     async def start(self):
         """Start the notification worker"""
         self.running = True
-        print("🚀 Notification worker started")
+        logger.info("🚀 Notification worker started")
+        
+        # Pick up notifications that were pending before the Redis queue existed
+        await notification_service.requeue_pending()
         
-        while self.running:
-            try:
-                await notification_service._process_notification_queue()
-                await asyncio.sleep(5)  # Process every 5 seconds
-                
-            except KeyboardInterrupt:
-                print("⏹️  Shutting down notification worker...")
-                self.running = False
-                break
-            except Exception as e:
-                print(f"❌ Notification worker error: {e}")
-                await asyncio.sleep(10)  # Wait longer if there's an error
+        # Deliveries go through the service's shared client, closed on the way out
+        try:
+            while self.running:
+                try:
+                    # Keep draining while work is due, otherwise wait briefly
+                    claimed = await notification_service._process_notification_queue()
+                    if not claimed:
+                        await asyncio.sleep(NOTIFICATION_POLL_INTERVAL)
+                    
+                except KeyboardInterrupt:
+                    logger.info("⏹️  Shutting down notification worker...")
+                    self.running = False
+                    break
+                except Exception:
+                    logger.exception("❌ Notification worker error")
+                    await asyncio.sleep(10)  # Wait longer if there's an error
+        finally:
+            await notification_service.close()
     
     def stop(self):
         """Stop the notification worker"""
@@ -33,12 +47,13 @@ class NotificationWorker:
 
 async def main():
     """Main worker function"""
+    setup_logging()
     worker = NotificationWorker()
     
     try:
         await worker.start()
     except KeyboardInterrupt:
-        print("👋 Notification worker stopped")
+        logger.info("👋 Notification worker stopped")
     finally:
         worker.stop()
 
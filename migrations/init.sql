@@ -63,22 +63,50 @@ CREATE TABLE IF NOT EXISTS webhook_subscriptions (
 );
 
 -- Create indexes for performance
-CREATE INDEX IF NOT EXISTS idx_hash_registry_hash_value ON hash_registry(hash_value);
+-- Hash lookups are equality-only (IN lists), so a hash index is enough
+DROP INDEX IF EXISTS idx_hash_registry_hash_value;
+CREATE INDEX IF NOT EXISTS idx_hash_registry_hash_value_hash ON hash_registry USING hash (hash_value);
 CREATE INDEX IF NOT EXISTS idx_hash_registry_source_system ON hash_registry(source_system);
-CREATE INDEX IF NOT EXISTS idx_hash_registry_created_at ON hash_registry(created_at);
 CREATE INDEX IF NOT EXISTS idx_hash_registry_severity ON hash_registry(severity_level);
 
 CREATE INDEX IF NOT EXISTS idx_notification_queue_status ON notification_queue(status);
 CREATE INDEX IF NOT EXISTS idx_notification_queue_target_system ON notification_queue(target_system);
-CREATE INDEX IF NOT EXISTS idx_notification_queue_created_at ON notification_queue(created_at);
 
-CREATE INDEX IF NOT EXISTS idx_hash_matches_detected_at ON hash_matches(detected_at);
 CREATE INDEX IF NOT EXISTS idx_hash_matches_primary_hash ON hash_matches(primary_hash_id);
 
+-- Insert-ordered timestamp columns only see range filters, so use small BRIN
+-- indexes; replaces the earlier B-tree indexes of the same columns
+DROP INDEX IF EXISTS idx_hash_registry_created_at;
+DROP INDEX IF EXISTS idx_notification_queue_created_at;
+DROP INDEX IF EXISTS idx_hash_matches_detected_at;
+CREATE INDEX IF NOT EXISTS idx_hash_registry_created_at_brin ON hash_registry USING BRIN (created_at) WITH (pages_per_range = 32);
+CREATE INDEX IF NOT EXISTS idx_notification_queue_created_at_brin ON notification_queue USING BRIN (created_at) WITH (pages_per_range = 32);
+CREATE INDEX IF NOT EXISTS idx_hash_matches_detected_at_brin ON hash_matches USING BRIN (detected_at) WITH (pages_per_range = 32);
+
 CREATE INDEX IF NOT EXISTS idx_audit_log_action ON audit_log(action);
 CREATE INDEX IF NOT EXISTS idx_audit_log_system_id ON audit_log(system_id);
+-- Stays B-tree: audit logs are read newest-first with ORDER BY ... LIMIT
 CREATE INDEX IF NOT EXISTS idx_audit_log_timestamp ON audit_log(timestamp);
 
 -- Create composite indexes
 CREATE INDEX IF NOT EXISTS idx_hash_registry_composite ON hash_registry(hash_value, source_system);
-CREATE INDEX IF NOT EXISTS idx_notification_queue_composite ON notification_queue(status, target_system);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_notification_queue_composite ON notification_queue(status, target_system);
+
+-- Aggregate notification queue counts per status in a single scan
+CREATE OR REPLACE FUNCTION queue_status_counts()
+RETURNS TABLE (status TEXT, cnt BIGINT)
+LANGUAGE sql STABLE
+AS $$
+    SELECT nq.status::TEXT, count(*) AS cnt
+    FROM notification_queue nq
+    GROUP BY nq.status;
+$$;
+
+-- Distinct reporting systems, avoids shipping every registry row to the client
+CREATE OR REPLACE FUNCTION distinct_source_systems()
+RETURNS TABLE (source_system TEXT)
+LANGUAGE sql STABLE
+AS $$
+    SELECT DISTINCT hr.source_system::TEXT
+    FROM hash_registry hr;
+$$;
\ No newline at end of file
@@ -1,22 +1,22 @@
 #!/usr/bin/env python3
 
 import uvicorn
-import asyncio
-from app.main import app
 from app.core.config import settings
 
-async def main():
+def main():
     """Main function to run the application"""
-    config = uvicorn.Config(
-        app,
+    # Passing the app as an import string lets uvicorn spawn worker
+    # processes (or the reloader); uvicorn.Server ignores `workers`
+    uvicorn.run(
+        "app.main:app",
         host="0.0.0.0",
         port=8000,
         log_level="info",
         reload=settings.debug,
-        workers=1 if settings.debug else 4
+        workers=1 if settings.debug else 4,
+        loop="uvloop",
+        http="httptools"
     )
-    server = uvicorn.Server(config)
-    await server.serve()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -33,19 +33,10 @@ def setup_database():
         with open(sql_file, 'r') as f:
             sql_content = f.read()
         
-        print("\n" + "="*60)
-        print("📋 MANUAL SETUP REQUIRED")
-        print("="*60)
-        print("Please follow these steps:")
-        print("1. Go to your Supabase dashboard")
-        print("2. Navigate to the SQL Editor")
-        print("3. Copy and paste the following SQL commands:")
-        print("="*60)
-        print(sql_content)
-        print("="*60)
-        print("4. Click 'Run' to execute the SQL")
-        print("5. Come back here and press Enter to test the connection")
-        input("\nPress Enter after you've run the SQL in Supabase...")
+        if apply_sql(sql_content):
+            print("✅ Schema applied")
+        else:
+            print_manual_steps(sql_content)
         
         # Test connection
         print("Testing database connection...")
@@ -60,9 +51,42 @@ def setup_database():
         print("\nTroubleshooting:")
         print("1. Make sure your .env file has correct Supabase credentials")
         print("2. Verify your Supabase project is active")
-        print("3. Check that you've run the SQL commands in Supabase SQL Editor")
+        print("3. Check that DATABASE_URL points at the Supabase Postgres instance")
         return False
 
+def apply_sql(sql_content):
+    """Run the whole migration over a direct Postgres connection in one transaction"""
+    try:
+        import psycopg
+        from app.core.config import settings
+        
+        print("Applying schema over DATABASE_URL...")
+        # Without parameters the script goes out as one simple-protocol query,
+        # so every statement runs in a single round-trip; the block commits once
+        with psycopg.connect(settings.database_url) as conn:
+            conn.execute(sql_content)
+        return True
+        
+    except Exception as e:
+        print(f"⚠️ Could not apply the schema automatically: {e}")
+        return False
+
+def print_manual_steps(sql_content):
+    """Fall back to pasting the SQL into the Supabase SQL Editor"""
+    print("\n" + "="*60)
+    print("📋 MANUAL SETUP REQUIRED")
+    print("="*60)
+    print("Please follow these steps:")
+    print("1. Go to your Supabase dashboard")
+    print("2. Navigate to the SQL Editor")
+    print("3. Copy and paste the following SQL commands:")
+    print("="*60)
+    print(sql_content)
+    print("="*60)
+    print("4. Click 'Run' to execute the SQL")
+    print("5. Come back here and press Enter to test the connection")
+    input("\nPress Enter after you've run the SQL in Supabase...")
+
 def create_init_sql(sql_file):
     """Create the init.sql file with our database schema"""
     sql_content = """-- Enable UUID extension
@@ -128,25 +152,53 @@ CREATE TABLE IF NOT EXISTS webhook_subscriptions (
 );
 
 -- Create indexes for performance
-CREATE INDEX IF NOT EXISTS idx_hash_registry_hash_value ON hash_registry(hash_value);
+-- Hash lookups are equality-only (IN lists), so a hash index is enough
+DROP INDEX IF EXISTS idx_hash_registry_hash_value;
+CREATE INDEX IF NOT EXISTS idx_hash_registry_hash_value_hash ON hash_registry USING hash (hash_value);
 CREATE INDEX IF NOT EXISTS idx_hash_registry_source_system ON hash_registry(source_system);
-CREATE INDEX IF NOT EXISTS idx_hash_registry_created_at ON hash_registry(created_at);
 CREATE INDEX IF NOT EXISTS idx_hash_registry_severity ON hash_registry(severity_level);
 
 CREATE INDEX IF NOT EXISTS idx_notification_queue_status ON notification_queue(status);
 CREATE INDEX IF NOT EXISTS idx_notification_queue_target_system ON notification_queue(target_system);
-CREATE INDEX IF NOT EXISTS idx_notification_queue_created_at ON notification_queue(created_at);
 
-CREATE INDEX IF NOT EXISTS idx_hash_matches_detected_at ON hash_matches(detected_at);
 CREATE INDEX IF NOT EXISTS idx_hash_matches_primary_hash ON hash_matches(primary_hash_id);
 
+-- Insert-ordered timestamp columns only see range filters, so use small BRIN
+-- indexes; replaces the earlier B-tree indexes of the same columns
+DROP INDEX IF EXISTS idx_hash_registry_created_at;
+DROP INDEX IF EXISTS idx_notification_queue_created_at;
+DROP INDEX IF EXISTS idx_hash_matches_detected_at;
+CREATE INDEX IF NOT EXISTS idx_hash_registry_created_at_brin ON hash_registry USING BRIN (created_at) WITH (pages_per_range = 32);
+CREATE INDEX IF NOT EXISTS idx_notification_queue_created_at_brin ON notification_queue USING BRIN (created_at) WITH (pages_per_range = 32);
+CREATE INDEX IF NOT EXISTS idx_hash_matches_detected_at_brin ON hash_matches USING BRIN (detected_at) WITH (pages_per_range = 32);
+
 CREATE INDEX IF NOT EXISTS idx_audit_log_action ON audit_log(action);
 CREATE INDEX IF NOT EXISTS idx_audit_log_system_id ON audit_log(system_id);
+-- Stays B-tree: audit logs are read newest-first with ORDER BY ... LIMIT
 CREATE INDEX IF NOT EXISTS idx_audit_log_timestamp ON audit_log(timestamp);
 
 -- Create composite indexes
 CREATE INDEX IF NOT EXISTS idx_hash_registry_composite ON hash_registry(hash_value, source_system);
-CREATE INDEX IF NOT EXISTS idx_notification_queue_composite ON notification_queue(status, target_system);"""
+CREATE INDEX IF NOT EXISTS idx_notification_queue_composite ON notification_queue(status, target_system);
+
+-- Aggregate notification queue counts per status in a single scan
+CREATE OR REPLACE FUNCTION queue_status_counts()
+RETURNS TABLE (status TEXT, cnt BIGINT)
+LANGUAGE sql STABLE
+AS $$
+    SELECT nq.status::TEXT, count(*) AS cnt
+    FROM notification_queue nq
+    GROUP BY nq.status;
+$$;
+
+-- Distinct reporting systems, avoids shipping every registry row to the client
+CREATE OR REPLACE FUNCTION distinct_source_systems()
+RETURNS TABLE (source_system TEXT)
+LANGUAGE sql STABLE
+AS $$
+    SELECT DISTINCT hr.source_system::TEXT
+    FROM hash_registry hr;
+$$;"""
     
     with open(sql_file, 'w') as f:
         f.write(sql_content)
@@ -67,9 +67,9 @@ check_prerequisites() {
     
     # Check required Python packages
     echo "Checking Python packages..."
-    python3 -c "import aiohttp, asyncio" 2>/dev/null || {
+    python3 -c "import aiohttp, asyncio, h2, httpx, numpy, orjson, psutil" 2>/dev/null || {
         print_warning "Installing required packages..."
-        pip3 install aiohttp
+        pip3 install aiohttp "httpx[http2]" numpy orjson psutil
     }
     print_success "Required packages available"
     
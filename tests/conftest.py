@@ -0,0 +1,31 @@
+import os
+import uuid
+
+import pytest
+import pytest_asyncio
+
+# Settings need these at import; tests only talk to Redis
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "test-key")
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/test")
+os.environ.setdefault("WEBHOOK_SECRET", "test-secret")
+
+from app.core.redis import RedisManager
+
+@pytest_asyncio.fixture
+async def redis_manager():
+    """A connected RedisManager, skipping the test when Redis is unreachable"""
+    manager = RedisManager()
+    try:
+        await manager.connect()
+        await manager.redis_client.ping()
+    except Exception as e:
+        pytest.skip(f"Redis not available: {e}")
+    
+    yield manager
+    await manager.disconnect()
+
+@pytest.fixture
+def queue_key():
+    """A throwaway sorted-set key for one test"""
+    return f"test:notification_q:{uuid.uuid4().hex}"
@@ -0,0 +1,33 @@
+import asyncio
+import time
+
+import pytest
+
+@pytest.mark.asyncio
+async def test_leased_member_becomes_due_after_lease_expires(redis_manager, queue_key):
+    await redis_manager.schedule_members(queue_key, {"n1": time.time()})
+    
+    try:
+        assert await redis_manager.lease_due_members(queue_key, 10, 0.5) == ["n1"]
+        
+        # Held by the lease, so no other worker can claim it
+        assert await redis_manager.lease_due_members(queue_key, 10, 0.5) == []
+        
+        await asyncio.sleep(0.6)
+        assert await redis_manager.lease_due_members(queue_key, 10, 0.5) == ["n1"]
+    finally:
+        await redis_manager.delete(queue_key)
+
+@pytest.mark.asyncio
+async def test_requeue_keeps_retry_backoff(redis_manager, queue_key):
+    retry_at = time.time() + 60
+    await redis_manager.schedule_members(queue_key, {"n1": retry_at})
+    
+    try:
+        # Worker start-up requeues every pending id with NX
+        await redis_manager.schedule_members(queue_key, {"n1": time.time(), "n2": time.time()}, nx=True)
+        
+        assert await redis_manager.redis_client.zscore(queue_key, "n1") == pytest.approx(retry_at)
+        assert await redis_manager.lease_due_members(queue_key, 10, 30) == ["n2"]
+    finally:
+        await redis_manager.delete(queue_key)